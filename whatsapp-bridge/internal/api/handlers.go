@@ -3,21 +3,38 @@ package api
 import (
 	"database/sql"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"io"
 	"net/http"
+	"os"
+	"path/filepath"
 	"strings"
 	"time"
 
 	"whatsapp-bridge/internal/types"
 )
 
+// Limits and temp location for multipart/form-data uploads to /api/send.
+// Variables rather than constants so tests can lower them or redirect them.
+var (
+	maxUploadSize    int64 = 100 << 20 // whole request body
+	maxFormFieldSize int64 = 64 << 10  // recipient / message fields
+	uploadTempDir          = "/tmp"    // parent of per-request upload dirs; must be an allowed media dir
+)
+
 // handleSendMessage handles POST /api/send for sending WhatsApp messages.
 //
-// Request body:
+// Request body (application/json):
 //   - recipient: WhatsApp JID (required, e.g., "1234567890@s.whatsapp.net")
 //   - message: Text content (required if media_path not provided)
 //   - media_path: Path to media file (optional, for images/videos/documents)
 //
+// Request body (multipart/form-data):
+//   - recipient: form field, as above
+//   - message: form field, optional caption
+//   - media: file part streamed to a temporary file and sent as media
+//
 // Response:
 //   - success: boolean
 //   - message_id: string (WhatsApp message ID on success)
@@ -33,7 +50,20 @@ func (s *Server) handleSendMessage(w http.ResponseWriter, r *http.Request) {
 
 	// Parse the request body
 	var req types.SendMessageRequest
-	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+	if strings.HasPrefix(r.Header.Get("Content-Type"), "multipart/form-data") {
+		parsed, cleanup, err := parseMultipartSend(w, r)
+		if err != nil {
+			var maxErr *http.MaxBytesError
+			if errors.As(err, &maxErr) {
+				SendJSONError(w, fmt.Sprintf("Request body exceeds %d bytes", maxErr.Limit), http.StatusRequestEntityTooLarge)
+				return
+			}
+			SendJSONError(w, fmt.Sprintf("Invalid multipart request: %v", err), http.StatusBadRequest)
+			return
+		}
+		defer cleanup()
+		req = parsed
+	} else if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
 		SendJSONError(w, "Invalid request format", http.StatusBadRequest)
 		return
 	}
@@ -70,6 +100,103 @@ func (s *Server) handleSendMessage(w http.ResponseWriter, r *http.Request) {
 	})
 }
 
+// parseMultipartSend reads a multipart/form-data send request part by part.
+// The "media" part is copied to a temporary directory under uploadTempDir
+// (one of the allowed media dirs) so the path-based SendMessage flow can upload it.
+// The returned cleanup func removes that directory and must always be called.
+func parseMultipartSend(w http.ResponseWriter, r *http.Request) (types.SendMessageRequest, func(), error) {
+	var req types.SendMessageRequest
+	var tmpDir string
+	cleanup := func() {
+		if tmpDir != "" {
+			_ = os.RemoveAll(tmpDir)
+		}
+	}
+
+	r.Body = http.MaxBytesReader(w, r.Body, maxUploadSize)
+	reader, err := r.MultipartReader()
+	if err != nil {
+		return req, cleanup, err
+	}
+
+	for {
+		part, err := reader.NextPart()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			cleanup()
+			return req, func() {}, err
+		}
+
+		switch part.FormName() {
+		case "recipient", "message":
+			// Read one byte past the limit so oversized fields are rejected
+			// instead of silently truncated
+			value, err := io.ReadAll(io.LimitReader(part, maxFormFieldSize+1))
+			if err == nil && int64(len(value)) > maxFormFieldSize {
+				err = fmt.Errorf("field %q exceeds %d bytes", part.FormName(), maxFormFieldSize)
+			}
+			if err != nil {
+				_ = part.Close()
+				cleanup()
+				return req, func() {}, err
+			}
+			if part.FormName() == "recipient" {
+				req.Recipient = string(value)
+			} else {
+				req.Message = string(value)
+			}
+
+		case "media":
+			if tmpDir != "" {
+				_ = part.Close()
+				cleanup()
+				return req, func() {}, fmt.Errorf("only one media part is allowed")
+			}
+
+			// Keep the original base name: the extension picks the media type
+			// and documents use it as their title. Collapse any ".." runs, which
+			// validateMediaPath rejects anywhere in the path.
+			name := filepath.Base(part.FileName())
+			for strings.Contains(name, "..") {
+				name = strings.ReplaceAll(name, "..", ".")
+			}
+			if name == "" || name == "." || name == string(filepath.Separator) {
+				name = "media"
+			}
+
+			tmpDir, err = os.MkdirTemp(uploadTempDir, "wa-upload-")
+			if err != nil {
+				tmpDir = ""
+				_ = part.Close()
+				return req, func() {}, err
+			}
+			req.MediaPath = filepath.Join(tmpDir, name)
+
+			f, err := os.Create(req.MediaPath)
+			if err != nil {
+				_ = part.Close()
+				cleanup()
+				return req, func() {}, err
+			}
+			_, err = io.Copy(f, part)
+			if closeErr := f.Close(); err == nil {
+				err = closeErr
+			}
+			if err != nil {
+				_ = part.Close()
+				cleanup()
+				return req, func() {}, err
+			}
+		}
+
+		_ = part.Close()
+	}
+
+	return req, cleanup, nil
+}
+
 // handleWebhooks handles GET/POST /api/webhooks for webhook management.
 //
 // GET: List all webhook configurations (secrets are masked)
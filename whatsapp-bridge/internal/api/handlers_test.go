@@ -0,0 +1,232 @@
+package api
+
+import (
+	"bytes"
+	"encoding/json"
+	"io"
+	"mime/multipart"
+	"net/http"
+	"net/http/httptest"
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+)
+
+// formPart is one part of a multipart/form-data request. Parts with a
+// filename are written as file parts, the rest as plain form fields.
+type formPart struct {
+	field    string
+	filename string
+	content  string
+}
+
+// newMultipartRequest builds a POST /api/send request from parts, in order.
+func newMultipartRequest(t *testing.T, parts []formPart) *http.Request {
+	t.Helper()
+
+	var buf bytes.Buffer
+	mw := multipart.NewWriter(&buf)
+	for _, p := range parts {
+		var w io.Writer
+		var err error
+		if p.filename != "" {
+			w, err = mw.CreateFormFile(p.field, p.filename)
+		} else {
+			w, err = mw.CreateFormField(p.field)
+		}
+		if err != nil {
+			t.Fatalf("creating part %q: %v", p.field, err)
+		}
+		if _, err := io.WriteString(w, p.content); err != nil {
+			t.Fatalf("writing part %q: %v", p.field, err)
+		}
+	}
+	if err := mw.Close(); err != nil {
+		t.Fatalf("closing multipart writer: %v", err)
+	}
+
+	r := httptest.NewRequest(http.MethodPost, "/api/send", &buf)
+	r.Header.Set("Content-Type", mw.FormDataContentType())
+	return r
+}
+
+// useTempUploadDir points uploadTempDir at a fresh test directory for the
+// duration of the test and returns it.
+func useTempUploadDir(t *testing.T) string {
+	t.Helper()
+
+	original := uploadTempDir
+	t.Cleanup(func() { uploadTempDir = original })
+	uploadTempDir = t.TempDir()
+	return uploadTempDir
+}
+
+// uploadDirs returns the upload temp dirs currently present under parent.
+func uploadDirs(t *testing.T, parent string) []string {
+	t.Helper()
+
+	matches, err := filepath.Glob(filepath.Join(parent, "wa-upload-*"))
+	if err != nil {
+		t.Fatalf("globbing upload dirs: %v", err)
+	}
+	return matches
+}
+
+func TestParseMultipartSend(t *testing.T) {
+	tests := []struct {
+		name        string
+		parts       []formPart
+		wantErr     bool
+		errContains string
+		wantMedia   string // base name of the uploaded file, "" when no media part
+	}{
+		// Valid requests
+		{"media with caption", []formPart{
+			{"recipient", "", "123"}, {"message", "", "hi"}, {"media", "photo.png", "data"},
+		}, false, "", "photo.png"},
+		{"double dot in filename", []formPart{
+			{"recipient", "", "123"}, {"media", "a..b.png", "data"},
+		}, false, "", "a.b.png"},
+		{"dot run in filename", []formPart{
+			{"recipient", "", "123"}, {"media", "a.....png", "data"},
+		}, false, "", "a.png"},
+		{"directory in filename", []formPart{
+			{"recipient", "", "123"}, {"media", "../../etc/passwd", "data"},
+		}, false, "", "passwd"},
+		{"missing media part", []formPart{
+			{"recipient", "", "123"}, {"message", "", "hi"},
+		}, false, "", ""},
+
+		// Invalid requests
+		{"second media part", []formPart{
+			{"recipient", "", "123"}, {"media", "a.png", "one"}, {"media", "b.png", "two"},
+		}, true, "only one media part", ""},
+		{"oversized field", []formPart{
+			{"recipient", "", "123"}, {"message", "", strings.Repeat("x", int(maxFormFieldSize)+1)},
+		}, true, "exceeds", ""},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			parent := useTempUploadDir(t)
+
+			req, cleanup, err := parseMultipartSend(httptest.NewRecorder(), newMultipartRequest(t, tt.parts))
+			defer cleanup()
+
+			if tt.wantErr {
+				if err == nil {
+					t.Fatalf("parseMultipartSend() = nil, want error containing %q", tt.errContains)
+				}
+				if !strings.Contains(err.Error(), tt.errContains) {
+					t.Errorf("parseMultipartSend() error = %v, want error containing %q", err, tt.errContains)
+				}
+				for _, dir := range uploadDirs(t, parent) {
+					t.Errorf("upload dir %s left behind after error", dir)
+				}
+				return
+			}
+
+			if err != nil {
+				t.Fatalf("parseMultipartSend() = %v, want nil", err)
+			}
+			if req.Recipient != "123" {
+				t.Errorf("Recipient = %q, want %q", req.Recipient, "123")
+			}
+			if tt.wantMedia == "" {
+				if req.MediaPath != "" {
+					t.Errorf("MediaPath = %q, want empty", req.MediaPath)
+				}
+				return
+			}
+
+			if got := filepath.Base(req.MediaPath); got != tt.wantMedia {
+				t.Errorf("MediaPath base = %q, want %q", got, tt.wantMedia)
+			}
+			// validateMediaPath rejects ".." anywhere and requires an allowed
+			// dir, which uploadTempDir is outside tests
+			if strings.Contains(req.MediaPath, "..") || !strings.HasPrefix(req.MediaPath, parent+string(filepath.Separator)) {
+				t.Errorf("MediaPath = %q would fail validateMediaPath", req.MediaPath)
+			}
+		})
+	}
+}
+
+func TestParseMultipartSend_CleanupRemovesTempDir(t *testing.T) {
+	parent := useTempUploadDir(t)
+	r := newMultipartRequest(t, []formPart{
+		{"recipient", "", "123"}, {"media", "photo.png", "data"},
+	})
+
+	req, cleanup, err := parseMultipartSend(httptest.NewRecorder(), r)
+	if err != nil {
+		cleanup()
+		t.Fatalf("parseMultipartSend() = %v, want nil", err)
+	}
+
+	data, err := os.ReadFile(req.MediaPath)
+	if err != nil {
+		cleanup()
+		t.Fatalf("reading uploaded media: %v", err)
+	}
+	if string(data) != "data" {
+		t.Errorf("uploaded media = %q, want %q", data, "data")
+	}
+
+	cleanup()
+
+	if _, err := os.Stat(filepath.Dir(req.MediaPath)); !os.IsNotExist(err) {
+		t.Errorf("temp dir %s still exists after cleanup (stat err: %v)", filepath.Dir(req.MediaPath), err)
+	}
+	if dirs := uploadDirs(t, parent); len(dirs) != 0 {
+		t.Errorf("upload dirs left after cleanup: %v", dirs)
+	}
+}
+
+func TestHandleSendMessage_MultipartErrors(t *testing.T) {
+	parent := useTempUploadDir(t)
+
+	// Shrink the body limit so the oversized case stays small
+	original := maxUploadSize
+	defer func() { maxUploadSize = original }()
+	maxUploadSize = 1024
+
+	tests := []struct {
+		name        string
+		parts       []formPart
+		wantStatus  int
+		errContains string
+	}{
+		{"body over max upload size", []formPart{
+			{"recipient", "", "123"}, {"media", "big.png", strings.Repeat("x", 4096)},
+		}, http.StatusRequestEntityTooLarge, "exceeds"},
+		{"missing media part and message", []formPart{
+			{"recipient", "", "123"},
+		}, http.StatusBadRequest, "Message or media path is required"},
+		{"second media part", []formPart{
+			{"recipient", "", "123"}, {"media", "a.png", "one"}, {"media", "b.png", "two"},
+		}, http.StatusBadRequest, "only one media part"},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			w := httptest.NewRecorder()
+			(&Server{}).handleSendMessage(w, newMultipartRequest(t, tt.parts))
+
+			if w.Code != tt.wantStatus {
+				t.Errorf("status = %d, want %d (body: %s)", w.Code, tt.wantStatus, w.Body.String())
+			}
+
+			var resp Response
+			if err := json.Unmarshal(w.Body.Bytes(), &resp); err != nil {
+				t.Fatalf("decoding response: %v", err)
+			}
+			if resp.Success || !strings.Contains(resp.Error, tt.errContains) {
+				t.Errorf("response = %+v, want error containing %q", resp, tt.errContains)
+			}
+			if dirs := uploadDirs(t, parent); len(dirs) != 0 {
+				t.Errorf("upload dirs left after request: %v", dirs)
+			}
+		})
+	}
+}
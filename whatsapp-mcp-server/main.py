@@ -1,4 +1,5 @@
 """WhatsApp MCP Server — send-only mode (stdio transport)."""
+import asyncio
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
@@ -9,8 +10,10 @@ from whatsapp import send_message as whatsapp_send_message
 mcp = FastMCP("whatsapp", host="0.0.0.0", port=8081)
 
 
+# Tools are async and run the blocking bridge calls in a worker thread, so
+# concurrent tool invocations don't serialize on the server's event loop.
 @mcp.tool()
-def send_message(recipient: str, message: str) -> dict[str, Any]:
+async def send_message(recipient: str, message: str) -> dict[str, Any]:
     """Send a WhatsApp message to a person or group.
 
     Args:
@@ -21,22 +24,26 @@ def send_message(recipient: str, message: str) -> dict[str, Any]:
     Returns:
         A dictionary containing success status, message_id, and timestamp
     """
-    return whatsapp_send_message(recipient, message)
+    return await asyncio.to_thread(whatsapp_send_message, recipient, message)
 
 
 @mcp.tool()
-def send_file(recipient: str, media_path: str) -> dict[str, Any]:
+async def send_file(recipient: str, media_path: str) -> dict[str, Any]:
     """Send a file (image, video, document) via WhatsApp.
 
     Args:
         recipient: Phone number with country code (no + or symbols),
                    or a JID (e.g., "123456789@s.whatsapp.net" or group "123456789@g.us")
-        media_path: The absolute path to the media file to send
+        media_path: Absolute path to the media file on the MCP server's filesystem
+                    (inside its container, not the host). It must resolve to a
+                    file under /app/media, /app/store or /tmp (or the dirs in
+                    ALLOWED_MEDIA_DIRS) and be at most 100 MiB. The file is
+                    uploaded to the bridge.
 
     Returns:
         A dictionary containing success status, message_id, and timestamp
     """
-    return whatsapp_send_file(recipient, media_path)
+    return await asyncio.to_thread(whatsapp_send_file, recipient, media_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+import importlib
+import os
+
+import pytest
+
+import whatsapp
+
+
+@pytest.fixture
+def media_dir(tmp_path, monkeypatch):
+    """An allowed media dir under tmp_path, as the only entry in the allow-list.
+
+    tmp_path usually sits under /tmp, which is allowed by default, so the
+    allow-list is narrowed to keep sibling dirs of tmp_path outside it.
+    """
+    media = tmp_path / "media"
+    media.mkdir()
+    monkeypatch.setattr(whatsapp, "_ALLOWED_MEDIA_DIRS", (os.path.realpath(media),))
+    return media
+
+
+@pytest.fixture
+def outside_file(tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    secret = other / "secret.txt"
+    secret.write_text("secret")
+    return secret
+
+
+def test_resolve_media_path_allowed(media_dir):
+    photo = media_dir / "photo.png"
+    photo.write_bytes(b"png")
+
+    assert whatsapp._resolve_media_path(str(photo)) == os.path.realpath(photo)
+
+
+def test_resolve_media_path_rejects_dotdot_component(media_dir):
+    (media_dir / "sub").mkdir()
+    photo = media_dir / "photo.png"
+    photo.write_bytes(b"png")
+
+    # Rejected even though it would resolve inside the allowed dir
+    with pytest.raises(ValueError, match="traversal"):
+        whatsapp._resolve_media_path(f"{media_dir}/sub/../photo.png")
+
+
+def test_resolve_media_path_rejects_symlink_escape(media_dir, outside_file):
+    link = media_dir / "link.png"
+    link.symlink_to(outside_file)
+
+    with pytest.raises(ValueError, match="outside allowed directories"):
+        whatsapp._resolve_media_path(str(link))
+
+
+def test_resolve_media_path_rejects_outside_path(media_dir, outside_file):
+    with pytest.raises(ValueError, match="outside allowed directories"):
+        whatsapp._resolve_media_path(str(outside_file))
+
+
+def test_resolve_media_path_rejects_sibling_prefix(media_dir, tmp_path):
+    # /x/media-evil shares a string prefix with /x/media but is not inside it
+    evil = tmp_path / "media-evil"
+    evil.mkdir()
+    (evil / "photo.png").write_bytes(b"png")
+
+    with pytest.raises(ValueError, match="outside allowed directories"):
+        whatsapp._resolve_media_path(str(evil / "photo.png"))
+
+
+def test_allowed_media_dirs_env_override(tmp_path, monkeypatch, outside_file):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    photo = second / "photo.png"
+    photo.write_bytes(b"png")
+
+    monkeypatch.setenv("ALLOWED_MEDIA_DIRS", f"{first}, {second},")
+    try:
+        importlib.reload(whatsapp)
+
+        assert whatsapp._ALLOWED_MEDIA_DIRS == (os.path.realpath(first), os.path.realpath(second))
+        assert whatsapp._resolve_media_path(str(photo)) == os.path.realpath(photo)
+        with pytest.raises(ValueError, match="outside allowed directories"):
+            whatsapp._resolve_media_path(str(outside_file))
+    finally:
+        monkeypatch.delenv("ALLOWED_MEDIA_DIRS")
+        importlib.reload(whatsapp)
+
+
+def test_send_file_rejects_path_without_posting(media_dir, outside_file, monkeypatch):
+    monkeypatch.setattr(whatsapp, "_post_send", lambda *a, **kw: pytest.fail("unexpected upload"))
+
+    result = whatsapp.send_file("123", str(outside_file))
+
+    assert result["success"] is False
+    assert result["error"].startswith("Invalid media path")
+
+
+def test_send_file_rejects_oversized_file_without_posting(media_dir, monkeypatch):
+    monkeypatch.setattr(whatsapp, "_post_send", lambda *a, **kw: pytest.fail("unexpected upload"))
+    monkeypatch.setattr(whatsapp, "_MAX_UPLOAD_SIZE", 4)
+    photo = media_dir / "photo.png"
+    photo.write_bytes(b"12345")
+
+    result = whatsapp.send_file("123", str(photo))
+
+    assert result["success"] is False
+    assert "exceeds 4 bytes" in result["error"]
+
+
+def test_dumps_uses_orjson():
+    assert whatsapp._dumps({"message": "héllo"}) == '{"message":"héllo"}'.encode()
+
+
+def test_dumps_falls_back_for_lone_surrogate():
+    assert whatsapp._dumps({"message": "bad \ud800"}) == b'{"message": "bad \\ud800"}'
@@ -3,7 +3,10 @@ import json
 import os
 from typing import Any
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from lib.bridge import _get_headers
 
@@ -12,77 +15,157 @@ _bridge_host = os.getenv('BRIDGE_HOST', 'localhost:8080')
 if ':' not in _bridge_host:
     _bridge_host = f"{_bridge_host}:8080"
 WHATSAPP_API_BASE_URL = f"http://{_bridge_host}/api"
+_SEND_URL = f"{WHATSAPP_API_BASE_URL}/send"
+
+# Directories send_file may read from (the bridge's allowedMediaDirs by
+# default); override with a comma-separated ALLOWED_MEDIA_DIRS
+_ALLOWED_MEDIA_DIRS = tuple(
+    os.path.realpath(d.strip())
+    for d in os.getenv('ALLOWED_MEDIA_DIRS', '/app/media,/app/store,/tmp').split(',')
+    if d.strip()
+)
+
+# The bridge rejects /send bodies over its maxUploadSize (100 MiB)
+_MAX_UPLOAD_SIZE = 100 << 20
+
+# API_KEY is fixed for the process lifetime, so build the headers once
+_HEADERS = _get_headers()
+
+# Shared session so sends reuse keep-alive connections to the bridge.
+# Retry's default allowed_methods exclude POST, so only connection failures
+# (where nothing reached the bridge) are retried and a send is never duplicated.
+_HTTP = requests.Session()
+# Content-Type is set per request: _JSON_HEADERS for JSON bodies, while
+# multipart uploads let requests add the form boundary
+_HTTP.headers.update({k: v for k, v in _HEADERS.items() if k != "Content-Type"})
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+)
+_HTTP.mount("http://", _adapter)
+_HTTP.mount("https://", _adapter)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Cap each connection attempt separately from the read timeout, so retried
+# connects to an unresponsive bridge host fail in seconds
+_CONNECT_TIMEOUT = 5
+
+
+def _err_body(content: bytes, limit: int = 512) -> str:
+    """Decode at most ``limit`` bytes of an error body for the result message."""
+    return content[:limit].decode("utf-8", "replace")
+
+
+def _dumps(payload: dict[str, Any]) -> bytes:
+    """Encode a JSON request body with orjson, falling back to the stdlib.
+
+    orjson rejects strings with unpaired surrogates; json.dumps escapes them
+    (e.g. \\ud800) and the bridge decodes those to U+FFFD.
+    """
+    try:
+        return orjson.dumps(payload)
+    except orjson.JSONEncodeError:
+        return json.dumps(payload).encode()
 
 
-def send_message(recipient: str, message: str) -> dict[str, Any]:
-    """Send a WhatsApp message and return structured result with message_id."""
-    try:
-        if not recipient:
-            return {"success": False, "error": "Recipient must be provided"}
+def _resolve_media_path(media_path: str) -> str:
+    """Resolve media_path and ensure it lies inside an allowed media directory.
+
+    Raises ValueError on traversal or when the resolved path (after symlinks)
+    is outside every directory in _ALLOWED_MEDIA_DIRS.
+    """
+    if ".." in media_path.split(os.sep):
+        raise ValueError("path traversal not allowed")
+
+    real_path = os.path.realpath(media_path)
+    for allowed in _ALLOWED_MEDIA_DIRS:
+        if os.path.commonpath([real_path, allowed]) == allowed:
+            return real_path
+
+    raise ValueError("media path outside allowed directories")
 
-        url = f"{WHATSAPP_API_BASE_URL}/send"
-        payload = {
-            "recipient": recipient,
-            "message": message,
-        }
 
-        response = requests.post(url, json=payload, headers=_get_headers(), timeout=30)
+def _send_result(result: dict[str, Any]) -> dict[str, Any]:
+    """Map a bridge /send response body to the result shape returned to callers."""
+    ok = result.get("success", False)
+    return {
+        "success": ok,
+        "message_id": result.get("message_id"),
+        "timestamp": result.get("timestamp"),
+        "recipient": result.get("recipient"),
+        "error": None if ok else result.get("message"),
+    }
+
+
+def _post_send(payload: dict[str, Any] | None = None, read_timeout: int = 30, **kwargs: Any) -> dict[str, Any]:
+    """POST a request to the bridge /send endpoint and return the structured result.
+
+    A ``payload`` is sent as a JSON body; other keyword arguments are passed
+    through to the session (e.g. data= and files= for multipart uploads).
+    ``read_timeout`` bounds the wait for the bridge's reply; connecting is
+    capped by _CONNECT_TIMEOUT.
+    """
+    try:
+        if payload is not None:
+            kwargs["data"] = _dumps(payload)
+            kwargs["headers"] = _JSON_HEADERS
+
+        response = _HTTP.post(_SEND_URL, timeout=(_CONNECT_TIMEOUT, read_timeout), **kwargs)
 
         if response.status_code == 200:
-            result = response.json()
-            return {
-                "success": result.get("success", False),
-                "message_id": result.get("message_id"),
-                "timestamp": result.get("timestamp"),
-                "recipient": result.get("recipient"),
-                "error": result.get("message") if not result.get("success") else None,
-            }
+            return _send_result(orjson.loads(response.content))
         else:
-            return {"success": False, "error": f"HTTP {response.status_code} - {response.text}"}
+            return {"success": False, "error": f"HTTP {response.status_code} - {_err_body(response.content)}"}
 
+    except orjson.JSONDecodeError:
+        return {"success": False, "error": f"Error parsing response: {_err_body(response.content)}"}
     except requests.RequestException as e:
         return {"success": False, "error": f"Request error: {str(e)}"}
-    except json.JSONDecodeError:
-        return {"success": False, "error": f"Error parsing response: {response.text}"}
     except Exception as e:
         return {"success": False, "error": f"Unexpected error: {str(e)}"}
 
 
-def send_file(recipient: str, media_path: str) -> dict[str, Any]:
-    """Send a file via WhatsApp and return structured result with message_id."""
-    try:
-        if not recipient:
-            return {"success": False, "error": "Recipient must be provided"}
+def send_message(recipient: str, message: str) -> dict[str, Any]:
+    """Send a WhatsApp message and return structured result with message_id."""
+    if not recipient:
+        return {"success": False, "error": "Recipient must be provided"}
 
-        if not media_path:
-            return {"success": False, "error": "Media path must be provided"}
+    payload = {
+        "recipient": recipient,
+        "message": message,
+    }
+    return _post_send(payload)
 
-        if not os.path.isfile(media_path):
-            return {"success": False, "error": f"Media file not found: {media_path}"}
 
-        url = f"{WHATSAPP_API_BASE_URL}/send"
-        payload = {
-            "recipient": recipient,
-            "media_path": media_path,
-        }
+def send_file(recipient: str, media_path: str) -> dict[str, Any]:
+    """Send a file via WhatsApp and return structured result with message_id."""
+    if not recipient:
+        return {"success": False, "error": "Recipient must be provided"}
 
-        response = requests.post(url, json=payload, headers=_get_headers(), timeout=30)
+    if not media_path:
+        return {"success": False, "error": "Media path must be provided"}
 
-        if response.status_code == 200:
-            result = response.json()
-            return {
-                "success": result.get("success", False),
-                "message_id": result.get("message_id"),
-                "timestamp": result.get("timestamp"),
-                "recipient": result.get("recipient"),
-                "error": result.get("message") if not result.get("success") else None,
-            }
-        else:
-            return {"success": False, "error": f"HTTP {response.status_code} - {response.text}"}
+    try:
+        real_path = _resolve_media_path(media_path)
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid media path: {str(e)}"}
+
+    try:
+        media = open(real_path, "rb")
+    except FileNotFoundError:
+        return {"success": False, "error": f"Media file not found: {media_path}"}
+    except OSError as e:
+        return {"success": False, "error": f"Error reading media file: {str(e)}"}
+
+    # Upload the file itself so the bridge does not need access to our filesystem
+    with media:
+        # Fail before reading a file the bridge would only reject with a 413
+        if os.fstat(media.fileno()).st_size > _MAX_UPLOAD_SIZE:
+            return {"success": False, "error": f"Media file exceeds {_MAX_UPLOAD_SIZE} bytes: {media_path}"}
+        return _post_send(
+            read_timeout=60,
+            data={"recipient": recipient},
+            files={"media": (os.path.basename(media_path), media)},
+        )
 
-    except requests.RequestException as e:
-        return {"success": False, "error": f"Request error: {str(e)}"}
-    except json.JSONDecodeError:
-        return {"success": False, "error": f"Error parsing response: {response.text}"}
-    except Exception as e:
-        return {"success": False, "error": f"Unexpected error: {str(e)}"}